@@ -30,7 +30,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'SECRET_KEY'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env.bool('DEBUG', default=True)
 
 ALLOWED_HOSTS = [
     '127.0.0.1',
@@ -109,6 +109,60 @@ DATABASES = {
 }
 
 
+# Cache
+# File-based so every gunicorn worker sees the same entries (and the same
+# invalidations) without running a cache server.
+
+# The file cache suits a single host. Each user keeps a version token plus
+# two fragments per page viewed, so MAX_ENTRIES must cover every active
+# user; every cache set (page views, not task writes) lists the cache
+# directory. Larger deployments
+# should set REDIS_URL (needs the redis package) to share one cache server.
+
+if env('REDIS_URL', default=None):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': env('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': env('CACHE_LOCATION', default=str(BASE_DIR / '.cache')),
+            'OPTIONS': {
+                'MAX_ENTRIES': env.int('CACHE_MAX_ENTRIES', default=20_000),
+                # Cull 1/10 of the entries when full, not Django's default 1/3
+                'CULL_FREQUENCY': env.int('CACHE_CULL_FREQUENCY', default=10),
+            },
+        }
+    }
+
+
+# Password hashing
+# PASSWORD_HASHER picks the algorithm new and upgraded hashes use; existing
+# hashes in any listed algorithm still verify and are rehashed on login.
+
+PASSWORD_HASH_ITERATIONS = env.int('PASSWORD_HASH_ITERATIONS', default=1_000_000)
+
+PASSWORD_HASH_WORKERS = env.int('PASSWORD_HASH_WORKERS', default=os.cpu_count() or 1)
+
+_PASSWORD_HASHERS = {
+    'pbkdf2_sha256': 'base.hashers.ConfigurablePBKDF2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt_sha256': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+
+PASSWORD_HASHER = env('PASSWORD_HASHER', default='pbkdf2_sha256')
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,55 @@
+"""
+Password hashing policy.
+
+The preferred algorithm and its cost come from settings (PASSWORD_HASHER,
+PASSWORD_HASH_ITERATIONS). Django's check_password() rehashes a password on
+successful login whenever the stored hash uses a different algorithm or
+cost, so changing the policy upgrades users transparently.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, make_password
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count taken from settings."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+# Hashing is CPU-bound and hashlib releases the GIL while it runs, so a small
+# thread pool keeps async callers' event loops free.
+_hashing_pool = None
+
+
+def hashing_pool():
+    global _hashing_pool
+    if _hashing_pool is None:
+        _hashing_pool = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+    return _hashing_pool
+
+
+def verify_password(raw_password, encoded):
+    """
+    Return (valid, needs_rehash) without saving anything, so the caller can
+    batch the rehash with its other writes.
+    """
+    outdated = []
+    valid = check_password(raw_password, encoded, setter=outdated.append)
+    return valid, bool(outdated)
+
+
+async def averify_password(raw_password, encoded):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hashing_pool(), verify_password, raw_password, encoded)
+
+
+async def amake_password(raw_password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hashing_pool(), make_password, raw_password)
@@ -0,0 +1,22 @@
+"""
+Background job handlers. Enqueue with JobService.enqueue("<name>", {...})
+and run them with `python manage.py run_jobs`.
+"""
+from django.core.management import call_command
+
+from .services.job_service import JobService
+
+
+@JobService.register("archive_completed_tasks")
+def archive_completed_tasks(days=30, batch_size=500):
+    call_command("archive_completed_tasks", days=days, batch_size=batch_size, pause=0)
+
+
+@JobService.register("rebalance_task_positions")
+def rebalance_task_positions(max_length=32):
+    call_command("rebalance_task_positions", max_length=max_length)
+
+
+@JobService.register("purge_idempotency_keys")
+def purge_idempotency_keys(hours=24):
+    call_command("purge_idempotency_keys", hours=hours)
@@ -0,0 +1,41 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from base.services.task_service import TaskService
+
+
+class Command(BaseCommand):
+    help = (
+        "Move tasks completed more than --days ago from the Task table into "
+        "ArchivedTask, in small batches. Safe to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=30,
+            help="Archive tasks completed (last updated) more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Tasks moved per transaction.",
+        )
+        parser.add_argument(
+            "--pause", type=float, default=0.05,
+            help="Seconds to sleep between batches so request writes can get in.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        total = 0
+        while True:
+            moved = TaskService.archive_completed_batch(cutoff, options["batch_size"])
+            if not moved:
+                break
+            total += moved
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} completed tasks."))
@@ -0,0 +1,229 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from base.models import CollaborativeList, Profile, Task
+from base.services.rank_service import RankService
+
+# Fixed-width ranks leave room for 62**5 tasks per column.
+POSITION_WIDTH = 5
+
+
+class Command(BaseCommand):
+    help = (
+        "Load large volumes of realistic synthetic users, collaborative lists "
+        "and tasks for local performance work. Deterministic for a given --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--lists", type=int, default=100)
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--collaborative-fraction", type=float, default=0.3,
+            help="Share of tasks that live in collaborative lists.",
+        )
+        parser.add_argument(
+            "--deleted-fraction", type=float, default=0.05,
+            help="Share of tasks that are soft-deleted.",
+        )
+        parser.add_argument(
+            "--prefix", default="synthetic_",
+            help="Username prefix, so generated users are easy to find and remove.",
+        )
+        parser.add_argument(
+            "--password", default="synthetic-password",
+            help="Password for every generated user (hashed once).",
+        )
+        parser.add_argument("--tokens", action="store_true", help="Also create auth tokens.")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1:
+            raise CommandError("--users must be at least 1.")
+        if options["lists"] < 1 and options["collaborative_fraction"] > 0:
+            raise CommandError("--lists must be at least 1 when --collaborative-fraction > 0.")
+        if User.objects.filter(username__startswith=options["prefix"]).exists():
+            raise CommandError(
+                f"Users named {options['prefix']}* already exist. Pass a different --prefix "
+                f"or remove them first."
+            )
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        started = time.monotonic()
+
+        if connection.vendor == "sqlite":
+            # Bulk-load settings; durability is irrelevant for throwaway data.
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA synchronous = OFF")
+                cursor.execute("PRAGMA journal_mode = MEMORY")
+                cursor.execute("PRAGMA cache_size = -200000")
+
+        with transaction.atomic():
+            profile_ids = self._create_users(options)
+            list_ids, list_members = self._create_lists(options, profile_ids)
+            task_count = self._create_tasks(options, profile_ids, list_ids, list_members)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(profile_ids)} users, {len(list_ids)} lists and {task_count} tasks "
+            f"in {time.monotonic() - started:.1f}s."
+        ))
+
+    # Helpers
+
+    def _batches(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _skewed_weights(self, count, alpha):
+        """Cumulative Pareto weights: a few heavy users, a long tail of light ones."""
+        return list(accumulate(self.rng.paretovariate(alpha) for _ in range(count)))
+
+    def _create_users(self, options):
+        # Hashing is the slow part of signup, so every user shares one hash.
+        password = make_password(options["password"])
+        prefix = options["prefix"]
+
+        user_ids = []
+        users = (
+            User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", password=password)
+            for i in range(options["users"])
+        )
+        for batch in self._batches(users):
+            user_ids.extend(user.pk for user in User.objects.bulk_create(batch))
+
+        profile_ids = []
+        for batch in self._batches(Profile(user_id=user_id) for user_id in user_ids):
+            profile_ids.extend(profile.pk for profile in Profile.objects.bulk_create(batch))
+
+        if options["tokens"]:
+            tokens = (Token(key=Token.generate_key(), user_id=user_id) for user_id in user_ids)
+            for batch in self._batches(tokens):
+                Token.objects.bulk_create(batch)
+
+        self.stdout.write(f"  users: {len(user_ids)}")
+        return profile_ids
+
+    def _create_lists(self, options, profile_ids):
+        list_ids = []
+        lists = (
+            CollaborativeList(name=f"List {i}", owner_id=self.rng.choice(profile_ids))
+            for i in range(options["lists"])
+        )
+        for batch in self._batches(lists):
+            list_ids.extend(collab_list.pk for collab_list in CollaborativeList.objects.bulk_create(batch))
+
+        # Most lists are small teams, a few are large; members are distinct.
+        Membership = CollaborativeList.members.through
+        max_members = min(len(profile_ids), 500)
+        list_members = []
+
+        def memberships():
+            for list_id in list_ids:
+                size = min(int(self.rng.paretovariate(1.2)) + 1, max_members)
+                members = self.rng.sample(profile_ids, size)
+                list_members.append(members)
+                for profile_id in members:
+                    yield Membership(collaborativelist_id=list_id, profile_id=profile_id)
+
+        for batch in self._batches(memberships()):
+            Membership.objects.bulk_create(batch)
+
+        self.stdout.write(f"  lists: {len(list_ids)} ({sum(map(len, list_members))} memberships)")
+        return list_ids, list_members
+
+    def _create_tasks(self, options, profile_ids, list_ids, list_members):
+        rng = self.rng
+        user_weights = self._skewed_weights(len(profile_ids), 1.16)
+        # Busier lists (more members) get proportionally more tasks.
+        list_weights = list(accumulate(len(members) * rng.paretovariate(1.5) for members in list_members))
+        # Within a list, a few members create most of its tasks.
+        member_weights = [self._skewed_weights(len(members), 1.16) for members in list_members]
+        collaborative_fraction = options["collaborative_fraction"] if list_ids else 0
+        deleted_fraction = options["deleted_fraction"]
+        statuses = Task.Status.values
+        priorities = Task.Priority.values
+        counters = {}
+        adapt = connection.ops.adapt_datetimefield_value
+
+        def tasks():
+            for i in range(options["tasks"]):
+                if rng.random() < collaborative_fraction:
+                    index = rng.choices(range(len(list_ids)), cum_weights=list_weights)[0]
+                    creator = rng.choices(list_members[index], cum_weights=member_weights[index])[0]
+                    scope = ("list", list_ids[index])
+                    profile_id, list_id = None, scope[1]
+                else:
+                    creator = rng.choices(profile_ids, cum_weights=user_weights)[0]
+                    scope = ("profile", creator)
+                    profile_id, list_id = creator, None
+
+                # Due dates cluster around today; overdue work is mostly done.
+                due = None
+                if rng.random() < 0.8:
+                    due = self.now + timedelta(days=rng.gauss(0, 30), hours=rng.randrange(24))
+                if due is not None and due < self.now:
+                    status = rng.choices(statuses, weights=[1, 2, 7])[0]
+                else:
+                    status = rng.choices(statuses, weights=[5, 3, 2])[0]
+
+                # Most tasks are recent, with a long tail of old ones.
+                created_at = self.now - timedelta(days=rng.expovariate(1 / 60))
+                updated_at = created_at + (self.now - created_at) * rng.random()
+
+                counters[scope] = counters.get(scope, 0) + 1
+                yield (
+                    f"Task {i}",
+                    "" if rng.random() < 0.5 else f"Synthetic task {i}",
+                    adapt(due),
+                    rng.choices(priorities, weights=[2, 5, 3])[0],
+                    status,
+                    profile_id,
+                    list_id,
+                    creator,
+                    RankService.encode(counters[scope], POSITION_WIDTH),
+                    1,
+                    adapt(created_at),
+                    adapt(updated_at),
+                    adapt(updated_at) if rng.random() < deleted_fraction else None,
+                )
+
+        # Tasks dominate the volume. Inserting prepared rows with executemany
+        # skips the per-value ORM compilation that bulk_create does, which is
+        # most of the cost at millions of rows.
+        columns = [
+            "title", "description", "due_datetime", "priority", "status", "profile_id",
+            "collaborative_list_id", "created_by_id", "position", "version",
+            "created_at", "updated_at", "deleted_at",
+        ]
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            connection.ops.quote_name(Task._meta.db_table),
+            ", ".join(connection.ops.quote_name(column) for column in columns),
+            ", ".join(["%s"] * len(columns)),
+        )
+
+        created = 0
+        with connection.cursor() as cursor:
+            for batch in self._batches(tasks()):
+                cursor.executemany(sql, batch)
+                created += len(batch)
+                if created % (self.batch_size * 100) == 0:
+                    self.stdout.write(f"  tasks: {created}")
+        return created
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from base.services.idempotency_service import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = "Delete stored Idempotency-Key responses older than --hours. Safe to run from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="How long keys can be replayed.")
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.purge(timedelta(hours=options["hours"]))
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} idempotency keys."))
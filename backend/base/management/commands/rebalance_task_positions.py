@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min, Q
+from django.db.models.functions import Length
+
+from base.models import Task
+from base.services.task_service import TaskService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite board positions as evenly spaced short ranks for columns whose "
+        "ranks have grown long or are missing. Safe to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-length", type=int, default=32,
+            help="Rebalance columns whose longest rank exceeds this many characters.",
+        )
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Rebalance every column regardless of rank length.",
+        )
+
+    def handle(self, *args, **options):
+        columns = (
+            Task.global_objects
+            .values("profile_id", "collaborative_list_id", "status")
+            .annotate(longest=Max(Length("position")), shortest=Min(Length("position")))
+            .order_by()
+        )
+        if not options["all"]:
+            columns = columns.filter(Q(longest__gt=options["max_length"]) | Q(shortest=0))
+
+        column_count = task_count = 0
+        for column in columns:
+            task_count += TaskService.rebalance_column(
+                profile=column["profile_id"],
+                collaborative_list=column["collaborative_list_id"],
+                status=column["status"],
+            )
+            column_count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebalanced {task_count} tasks in {column_count} columns."
+        ))
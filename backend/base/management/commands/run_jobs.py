@@ -0,0 +1,96 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from base.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the database queue. Starts --concurrency "
+        "worker processes; each claims one job at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument(
+            "--visibility-timeout", type=int, default=300,
+            help=(
+                "Seconds a claimed job stays hidden without a heartbeat. Running jobs renew "
+                "their lease every third of this, so it only bounds recovery after a crash."
+            ),
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is ready to run.")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] <= 1:
+            processed = work(options)
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs."))
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=work, args=(options,)) for _ in range(options["concurrency"])]
+        for worker in workers:
+            worker.start()
+
+        def stop(signum, frame):
+            for worker in workers:
+                if worker.is_alive():
+                    os.kill(worker.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS(f"{len(workers)} workers stopped."))
+
+
+def work(options):
+    """Claim and run jobs until stopped (or, with --burst, until none are ready)."""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    # Finish the current job before exiting
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    processed = 0
+    while not stopping:
+        try:
+            job = JobService.claim(worker_id, visibility_timeout=options["visibility_timeout"])
+        except OperationalError:
+            # SQLite busy with another writer; back off and retry
+            time.sleep(options["poll_interval"])
+            continue
+
+        if job is None:
+            if options["burst"]:
+                break
+            time.sleep(options["poll_interval"])
+            continue
+
+        try:
+            JobService.run(job, visibility_timeout=options["visibility_timeout"])
+        except OperationalError:
+            # Outcome not recorded; the lease expires and the job is retried
+            logger.exception("Could not record outcome of job %s", job.pk)
+        processed += 1
+
+    connections.close_all()
+    return processed
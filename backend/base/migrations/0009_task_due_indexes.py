@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0008_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['profile', 'due_datetime'], name='task_personal_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['collaborative_list', 'due_datetime'], name='task_collab_due_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 13:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0010_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('created', 'Created'), ('edited', 'Edited'), ('completed', 'Completed'), ('deleted', 'Deleted'), ('restored', 'Restored')], max_length=10)),
+                ('task_id', models.IntegerField()),
+                ('task_title', models.CharField(max_length=200)),
+                ('created_at', models.DateTimeField()),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity', to='base.profile')),
+                ('collaborative_list', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='base.collaborativelist')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['collaborative_list', '-id'], name='list_activity_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django_softdelete.models import SoftDeleteModel
 from django.contrib.auth.models import User
 
@@ -67,5 +68,149 @@ class Task(SoftDeleteModel):
         null=True, 
         blank=True
     )
+    # Lexicographic rank within the (list, status) column, see RankService.
+    position = models.CharField(max_length=255, blank=True, default='')
+    # Bumped on every edit; clients send it back (If-Match / "version") so
+    # concurrent edits are detected instead of silently overwritten.
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['profile', 'status', 'position'], name='task_personal_column_idx'),
+            models.Index(fields=['collaborative_list', 'status', 'position'], name='task_collab_column_idx'),
+            models.Index(fields=['status', 'updated_at'], name='task_status_updated_idx'),
+            models.Index(fields=['profile', 'due_datetime'], name='task_personal_due_idx'),
+            models.Index(fields=['collaborative_list', 'due_datetime'], name='task_collab_due_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.priority}) - {self.status}"
+
+
+class ArchivedTask(models.Model):
+    """
+    Cold storage for tasks completed long ago (see archive_completed_tasks).
+
+    Keeps the original task id so links and references stay stable, while
+    the hot Task table and its indexes only hold active work.
+    """
+    id = models.IntegerField(primary_key=True)
+    created_by = models.ForeignKey(
+        Profile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='created_archived_tasks'
+    )
+    title = models.CharField(max_length=200)
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='archived_tasks', null=True, blank=True)
+    description = models.TextField(null=True, blank=True)
+    due_datetime = models.DateTimeField(null=True, blank=True)
+    priority = models.CharField(max_length=10, choices=Task.Priority.choices)
+    status = models.CharField(max_length=15, choices=Task.Status.choices)
+    position = models.CharField(max_length=255, blank=True, default='')
+    version = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    # Set for tasks that were already soft-deleted when archived
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    collaborative_list = models.ForeignKey(
+        CollaborativeList,
+        on_delete=models.CASCADE,
+        related_name='archived_tasks',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['profile', '-updated_at'], name='archived_personal_idx'),
+            models.Index(fields=['collaborative_list', '-updated_at'], name='archived_collab_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
+class Job(models.Model):
+    """A unit of background work, stored in the main database (see JobService)."""
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    # Higher runs first
+    priority = models.IntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField()
+    # Lease held by the worker running the job; expires after the visibility timeout
+    locked_by = models.CharField(max_length=100, null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_at'], name='job_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response for a client-supplied Idempotency-Key, so retried POSTs
+    replay the first result instead of writing again.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    scope = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    request_fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'scope', 'key'], name='unique_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key} ({self.user_id})"
+
+
+class ListActivity(models.Model):
+    """
+    One entry in a collaborative list's activity history. Written in batches
+    by ActivityService, so `created_at` is the time of the action, not of the
+    insert. The task is referenced by id only so history outlives the task.
+    """
+    class Action(models.TextChoices):
+        CREATED = 'created', 'Created'
+        EDITED = 'edited', 'Edited'
+        COMPLETED = 'completed', 'Completed'
+        DELETED = 'deleted', 'Deleted'
+        RESTORED = 'restored', 'Restored'
+
+    collaborative_list = models.ForeignKey(CollaborativeList, on_delete=models.CASCADE, related_name='activity')
+    actor = models.ForeignKey(Profile, on_delete=models.SET_NULL, null=True, blank=True, related_name='activity')
+    action = models.CharField(max_length=10, choices=Action.choices)
+    task_id = models.IntegerField()
+    task_title = models.CharField(max_length=200)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['collaborative_list', '-id'], name='list_activity_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.task_title} in list {self.collaborative_list_id}"
@@ -1,15 +1,24 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from rest_framework.validators import UniqueValidator
-from .models import Task, Profile, CollaborativeList
+from .models import ArchivedTask, Task, Profile, CollaborativeList, ListActivity
 
 class TaskSerializer(serializers.ModelSerializer):
     created_by_username = serializers.CharField(source='created_by.user.username', read_only=True)
 
     class Meta:
         model = Task
-        fields = ['id', 'title', 'description', 'due_datetime', 'priority', 'status', 'created_at', 'updated_at', 'created_by_username']
-        read_only_fields = ('id', 'created_at', 'updated_at', 'created_by_username')
+        fields = ['id', 'title', 'description', 'due_datetime', 'priority', 'status', 'position', 'version', 'created_at', 'updated_at', 'created_by_username']
+        read_only_fields = ('id', 'position', 'version', 'created_at', 'updated_at', 'created_by_username')
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    created_by_username = serializers.CharField(source='created_by.user.username', read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        fields = ['id', 'title', 'description', 'due_datetime', 'priority', 'status', 'position', 'version', 'created_at', 'updated_at', 'archived_at', 'created_by_username']
+        read_only_fields = fields
 
 
 class CollaborativeListSerializer(serializers.ModelSerializer):
@@ -29,6 +38,15 @@ class CollaborativeListSerializer(serializers.ModelSerializer):
         return obj.tasks.count()
 
 
+class ListActivitySerializer(serializers.ModelSerializer):
+    actor_username = serializers.CharField(source='actor.user.username', read_only=True, default=None)
+
+    class Meta:
+        model = ListActivity
+        fields = ['id', 'action', 'task_id', 'task_title', 'actor_username', 'created_at']
+        read_only_fields = fields
+
+
 class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = Profile
@@ -82,6 +100,15 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+class SignupSerializer(serializers.Serializer):
+    """Field validation for signup. Uniqueness is checked by UserService.signup in one query."""
+    username = serializers.CharField(required=True, max_length=150)
+    email = serializers.EmailField(required=True)
+    password = serializers.CharField(write_only=True, required=True, min_length=6, error_messages={
+        'required': 'Password is required.',
+        'min_length': 'Password must be at least 6 characters long.'
+    })
+
 class SecurityQuestionSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
 
@@ -0,0 +1,128 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from ..models import ListActivity, Task
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityService:
+    """
+    Write-behind activity log for collaborative lists.
+
+    Events are buffered in memory and inserted with one bulk_create when the
+    buffer reaches FLUSH_SIZE, every FLUSH_INTERVAL seconds, and at process
+    exit, so requests never pay for an extra synchronous insert. The buffer
+    is capped at MAX_BUFFER: if the database falls behind, the oldest events
+    are dropped (and counted) instead of growing memory without bound.
+    After a failed flush the flusher backs off, doubling the wait up to
+    RETRY_MAX_SECONDS, rather than retrying on every new event.
+    """
+
+    FLUSH_SIZE = 100
+    FLUSH_INTERVAL = 2.0
+    MAX_BUFFER = 10_000
+    RETRY_MAX_SECONDS = 60
+
+    _buffer = deque()
+    _lock = threading.Lock()
+    _flush_lock = threading.Lock()
+    _wakeup = threading.Event()
+    _flusher_pid = None
+    dropped = 0
+    failures = 0
+
+    @classmethod
+    def record(cls, task, action, actor=None):
+        """Queue an event for a collaborative task once the current transaction commits."""
+        if task.collaborative_list_id is None:
+            return
+        event = ListActivity(
+            collaborative_list_id=task.collaborative_list_id,
+            actor=actor,
+            action=action,
+            task_id=task.pk,
+            task_title=task.title,
+            created_at=timezone.now(),
+        )
+        transaction.on_commit(lambda: cls._append([event]))
+
+    @classmethod
+    def record_update(cls, task, previous_status, actor=None):
+        completed = task.status == Task.Status.COMPLETED and previous_status != Task.Status.COMPLETED
+        cls.record(task, ListActivity.Action.COMPLETED if completed else ListActivity.Action.EDITED, actor)
+
+    @classmethod
+    def _append(cls, events, front=False, wake=True):
+        with cls._lock:
+            if front:
+                cls._buffer.extendleft(reversed(events))
+            else:
+                cls._buffer.extend(events)
+            overflow = len(cls._buffer) - cls.MAX_BUFFER
+            for _ in range(max(overflow, 0)):
+                cls._buffer.popleft()
+            if overflow > 0:
+                cls.dropped += overflow
+            size = len(cls._buffer)
+
+        if overflow > 0:
+            logger.warning("Activity buffer full; dropped %d events (%d total)", overflow, cls.dropped)
+        cls._ensure_flusher()
+        if wake and size >= cls.FLUSH_SIZE:
+            cls._wakeup.set()
+
+    @classmethod
+    def flush(cls):
+        """Insert everything buffered so far. Returns the number of events written."""
+        with cls._flush_lock:
+            with cls._lock:
+                events = list(cls._buffer)
+                cls._buffer.clear()
+            if not events:
+                return 0
+            try:
+                ListActivity.objects.bulk_create(events, batch_size=500)
+            except DatabaseError:
+                cls.failures += 1
+                if cls.failures == 1:
+                    logger.exception("Could not flush %d activity events", len(events))
+                else:
+                    logger.warning("Could not flush %d activity events (attempt %d)", len(events), cls.failures)
+                # Keep them for the next attempt, ahead of newer events
+                cls._append(events, front=True, wake=False)
+                return 0
+            cls.failures = 0
+            return len(events)
+
+    @classmethod
+    def _ensure_flusher(cls):
+        # One flusher thread per process; re-created after a fork
+        if cls._flusher_pid == os.getpid():
+            return
+        with cls._lock:
+            if cls._flusher_pid == os.getpid():
+                return
+            cls._flusher_pid = os.getpid()
+            threading.Thread(target=cls._run_flusher, name="activity-flusher", daemon=True).start()
+
+    @classmethod
+    def _run_flusher(cls):
+        while True:
+            cls._wakeup.wait(cls.FLUSH_INTERVAL)
+            cls._wakeup.clear()
+            cls.flush()
+            # This thread's connection would otherwise stay open forever
+            connection.close()
+            if cls.failures:
+                # Sleep rather than wait, so new events can't cut the backoff short
+                time.sleep(min(cls.FLUSH_INTERVAL * 2 ** (cls.failures - 1), cls.RETRY_MAX_SECONDS))
+
+
+atexit.register(ActivityService.flush)
@@ -0,0 +1,73 @@
+from django.db import transaction
+from ..models import CollaborativeList, Profile
+
+
+class CollaborativeListService:
+
+    MAX_BULK_USERNAMES = 1000
+
+    @staticmethod
+    def _profiles_by_username(usernames):
+        profiles = Profile.objects.filter(user__username__in=usernames).select_related('user')
+        return {profile.user.username: profile for profile in profiles}
+
+    @staticmethod
+    @transaction.atomic
+    def add_members(collab_list, usernames):
+        """
+        Add many members in one batch.
+
+        Returns {username: "added" | "already_member" | "not_found"}.
+        """
+        Membership = CollaborativeList.members.through
+        profiles = CollaborativeListService._profiles_by_username(usernames)
+        existing = set(
+            Membership.objects.filter(
+                collaborativelist=collab_list, profile__in=profiles.values()
+            ).values_list('profile_id', flat=True)
+        )
+
+        results = {}
+        new_rows = []
+        for username in usernames:
+            profile = profiles.get(username)
+            if profile is None:
+                results[username] = "not_found"
+            elif profile.id in existing:
+                results[username] = "already_member"
+            else:
+                results[username] = "added"
+                existing.add(profile.id)
+                new_rows.append(Membership(collaborativelist=collab_list, profile=profile))
+
+        Membership.objects.bulk_create(new_rows, ignore_conflicts=True)
+        return results
+
+    @staticmethod
+    @transaction.atomic
+    def remove_members(collab_list, usernames):
+        """
+        Remove many members in one batch.
+
+        Returns {username: "removed" | "not_member" | "not_found"}.
+        """
+        Membership = CollaborativeList.members.through
+        profiles = CollaborativeListService._profiles_by_username(usernames)
+        existing = set(
+            Membership.objects.filter(
+                collaborativelist=collab_list, profile__in=profiles.values()
+            ).values_list('profile_id', flat=True)
+        )
+
+        results = {}
+        for username in usernames:
+            profile = profiles.get(username)
+            if profile is None:
+                results[username] = "not_found"
+            elif profile.id in existing:
+                results[username] = "removed"
+            else:
+                results[username] = "not_member"
+
+        Membership.objects.filter(collaborativelist=collab_list, profile_id__in=existing).delete()
+        return results
@@ -0,0 +1,85 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.response import Response
+from ..models import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL = timedelta(hours=24)
+
+
+class IdempotencyService:
+    """
+    Idempotency-Key support for POST actions.
+
+    The key is reserved by inserting a row in the same transaction as the
+    write itself. A concurrent duplicate hits the unique constraint (after
+    the first transaction commits) instead of waiting on an explicit lock,
+    and then replays the stored response. If the write fails, the rollback
+    also removes the reservation, so the client can simply retry.
+    """
+
+    @staticmethod
+    def fingerprint(data):
+        body = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    @staticmethod
+    def replay(record, fingerprint):
+        if record.request_fingerprint != fingerprint:
+            return Response(
+                {"error": "Idempotency-Key was already used with a different request."},
+                status=422,
+            )
+        if record.status_code is None:
+            return Response({"error": "A request with this Idempotency-Key is in progress."}, status=409)
+        return Response(record.response_body, status=record.status_code, headers={"Idempotent-Replayed": "true"})
+
+    @staticmethod
+    def purge(older_than=DEFAULT_TTL):
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - older_than).delete()
+        return deleted
+
+
+def idempotent(scope):
+    """Decorator for viewset actions: honour an optional Idempotency-Key header."""
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get("Idempotency-Key")
+            if not key:
+                return view_method(self, request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response({"error": "Idempotency-Key is too long."}, status=400)
+
+            # Member actions are keyed per object, e.g. add_member on list 3
+            full_scope = f"{scope}:{kwargs['pk']}" if "pk" in kwargs else scope
+            fingerprint = IdempotencyService.fingerprint(request.data)
+            lookup = {"user": request.user, "scope": full_scope, "key": key}
+
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        IdempotencyKey.objects.create(request_fingerprint=fingerprint, **lookup)
+                except IntegrityError:
+                    return IdempotencyService.replay(IdempotencyKey.objects.get(**lookup), fingerprint)
+
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code >= 500:
+                    # Don't pin a server error to the key; let the client retry
+                    transaction.set_rollback(True)
+                    return response
+
+                IdempotencyKey.objects.filter(**lookup).update(
+                    status_code=response.status_code,
+                    response_body=response.data,
+                )
+                return response
+        return wrapper
+    return decorator
+
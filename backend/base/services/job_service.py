@@ -0,0 +1,150 @@
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+
+from django.db import DatabaseError, connection
+from django.db.models import F, Q
+from django.utils import timezone
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    Database-backed job queue.
+
+    Workers claim a job with a conditional UPDATE that only succeeds while
+    the job is still claimable, so two workers can never both win it. A claim
+    is a lease: while the handler runs, a heartbeat keeps extending
+    `locked_until`; if the worker dies, the heartbeat stops and the job
+    becomes claimable again once the visibility timeout passes. Delivery is
+    therefore at-least-once, and handlers should be safe to re-run.
+    """
+
+    handlers = {}
+
+    RETRY_BASE_SECONDS = 10
+    RETRY_MAX_SECONDS = 60 * 60
+
+    @classmethod
+    def register(cls, name):
+        """Decorator: `@JobService.register("name")` on a function taking the payload as kwargs."""
+        def decorator(func):
+            cls.handlers[name] = func
+            return func
+        return decorator
+
+    @staticmethod
+    def enqueue(name, payload=None, priority=0, delay=None, max_attempts=5):
+        run_at = timezone.now() + (delay or timedelta())
+        return Job.objects.create(
+            name=name,
+            payload=payload or {},
+            priority=priority,
+            run_at=run_at,
+            max_attempts=max_attempts,
+        )
+
+    @staticmethod
+    def _claimable(now):
+        return Q(status=Job.Status.QUEUED, run_at__lte=now) | Q(
+            status=Job.Status.RUNNING, locked_until__lt=now
+        )
+
+    @staticmethod
+    def claim(worker_id, visibility_timeout=300, candidates=5):
+        """Lease the most urgent ready job for `worker_id`, or return None."""
+        now = timezone.now()
+        ids = list(
+            Job.objects.filter(JobService._claimable(now))
+            .order_by('-priority', 'run_at', 'id')
+            .values_list('id', flat=True)[:candidates]
+        )
+        for job_id in ids:
+            claimed = Job.objects.filter(JobService._claimable(now), pk=job_id).update(
+                status=Job.Status.RUNNING,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+                attempts=F('attempts') + 1,
+            )
+            if claimed:
+                return Job.objects.get(pk=job_id)
+        return None
+
+    @staticmethod
+    def extend_lease(job, visibility_timeout):
+        """Push out the lease on a job this worker still holds. Returns False if it was lost."""
+        return bool(Job.objects.filter(pk=job.pk, locked_by=job.locked_by, status=Job.Status.RUNNING).update(
+            locked_until=timezone.now() + timedelta(seconds=visibility_timeout),
+        ))
+
+    @staticmethod
+    def _heartbeat(job, visibility_timeout, stopped):
+        # Renew well before expiry so one missed beat (e.g. SQLite busy) is harmless
+        interval = max(visibility_timeout / 3, 1)
+        try:
+            while not stopped.wait(interval):
+                try:
+                    if not JobService.extend_lease(job, visibility_timeout):
+                        logger.warning("Lost the lease on job %s (%s)", job.pk, job.name)
+                        return
+                except DatabaseError:
+                    logger.warning("Could not extend the lease on job %s", job.pk, exc_info=True)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def complete(job):
+        return Job.objects.filter(pk=job.pk, locked_by=job.locked_by, status=Job.Status.RUNNING).update(
+            status=Job.Status.SUCCEEDED,
+            locked_by=None,
+            locked_until=None,
+            finished_at=timezone.now(),
+        )
+
+    @staticmethod
+    def fail(job, error):
+        """Requeue with exponential backoff, or mark failed after max_attempts."""
+        now = timezone.now()
+        changes = {'locked_by': None, 'locked_until': None, 'last_error': error}
+        if job.attempts >= job.max_attempts:
+            changes.update(status=Job.Status.FAILED, finished_at=now)
+        else:
+            delay = min(JobService.RETRY_BASE_SECONDS * 2 ** (job.attempts - 1), JobService.RETRY_MAX_SECONDS)
+            delay *= random.uniform(0.8, 1.2)
+            changes.update(status=Job.Status.QUEUED, run_at=now + timedelta(seconds=delay))
+        return Job.objects.filter(pk=job.pk, locked_by=job.locked_by, status=Job.Status.RUNNING).update(**changes)
+
+    @staticmethod
+    def run(job, visibility_timeout=300):
+        """Execute a claimed job and record the outcome. Returns True on success."""
+        handler = JobService.handlers.get(job.name)
+        if handler is None:
+            # Retrying cannot help an unknown job
+            job.attempts = job.max_attempts
+            JobService.fail(job, f"No handler registered for {job.name!r}.")
+            return False
+
+        stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=JobService._heartbeat, args=(job, visibility_timeout, stopped),
+            name=f"job-{job.pk}-heartbeat", daemon=True,
+        )
+        heartbeat.start()
+        try:
+            # Handlers manage their own transactions so long jobs can commit
+            # in batches instead of holding SQLite's write lock throughout.
+            handler(**job.payload)
+        except Exception:
+            logger.exception("Job %s (%s) failed", job.pk, job.name)
+            JobService.fail(job, traceback.format_exc())
+            return False
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+        JobService.complete(job)
+        return True
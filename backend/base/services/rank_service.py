@@ -0,0 +1,77 @@
+import string
+
+
+class RankService:
+    """
+    Lexicographic ranks for manual ordering.
+
+    A rank is a base-62 string read as a fraction after the point, so there is
+    always room for another rank between any two. Moving a task only rewrites
+    that task's rank. Ranks never end in the zero digit, otherwise no rank
+    could sort directly before them.
+    """
+
+    DIGITS = string.digits + string.ascii_uppercase + string.ascii_lowercase
+    ZERO = DIGITS[0]
+
+    @classmethod
+    def between(cls, before=None, after=None):
+        """Return a rank strictly greater than `before` and smaller than `after`.
+
+        Either bound may be None (or empty) for the start/end of the column.
+        """
+        before = before or ''
+        after = after or None
+        if after is not None and before >= after:
+            raise ValueError(f"Rank {before!r} is not smaller than {after!r}.")
+        if after is None and before:
+            # Appending is the common case; stepping keeps ranks short.
+            return cls._increment(before)
+        return cls._midpoint(before, after)
+
+    @classmethod
+    def spread(cls, count):
+        """Return `count` evenly spaced, increasing ranks."""
+        base = len(cls.DIGITS)
+        width = 1
+        while base ** width <= count:
+            width += 1
+        step = base ** width // (count + 1)
+        return [cls.encode(i * step, width) for i in range(1, count + 1)]
+
+    @classmethod
+    def encode(cls, value, width):
+        """Rank for the positive integer `value` among `width`-digit slots."""
+        base = len(cls.DIGITS)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, base)
+            digits.append(cls.DIGITS[digit])
+        # Dropping trailing zeros keeps the order (ranks are fractions)
+        return ''.join(reversed(digits)).rstrip(cls.ZERO)
+
+    @classmethod
+    def _increment(cls, rank):
+        for i, char in enumerate(rank):
+            digit = cls.DIGITS.index(char)
+            if digit < len(cls.DIGITS) - 1:
+                return rank[:i] + cls.DIGITS[digit + 1]
+        return rank + cls.DIGITS[1]
+
+    @classmethod
+    def _midpoint(cls, a, b):
+        # Strip the shared prefix so the digits that differ sit at index 0.
+        if b is not None:
+            n = 0
+            while (a[n] if n < len(a) else cls.ZERO) == b[n]:
+                n += 1
+            if n > 0:
+                return b[:n] + cls._midpoint(a[n:], b[n:])
+
+        digit_a = cls.DIGITS.index(a[0]) if a else 0
+        digit_b = cls.DIGITS.index(b[0]) if b is not None else len(cls.DIGITS)
+        if digit_b - digit_a > 1:
+            return cls.DIGITS[(digit_a + digit_b + 1) // 2]
+        if b is not None and len(b) > 1:
+            return b[:1]
+        return cls.DIGITS[digit_a] + cls._midpoint(a[1:], None)
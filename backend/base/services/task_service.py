@@ -1,8 +1,44 @@
+import uuid
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from ..models import Task
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Max, Value, When
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+from ..models import ArchivedTask, Task
+from .rank_service import RankService
 
 class TaskService:
 
+    PAGE_CACHE_VERSION_KEY = "task_page_version:{}"
+
+    @staticmethod
+    def page_cache_version(profile_id):
+        """Token in the cache keys of a user's server-rendered task pages."""
+        key = TaskService.PAGE_CACHE_VERSION_KEY.format(profile_id)
+        version = cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            cache.set(key, version, None)
+        return version
+
+    @staticmethod
+    def invalidate_page_cache(*profile_ids):
+        """
+        Drop every cached page for these users once the write commits.
+
+        Deleting the version token is enough: the next page view mints a new
+        one, orphaning the old fragments. A delete is a single unlink (or
+        nothing, for users without cached pages), whereas a file-cache set
+        scans the whole cache directory, so task writes stay cheap.
+        """
+        keys = [
+            TaskService.PAGE_CACHE_VERSION_KEY.format(profile_id)
+            for profile_id in set(profile_ids) if profile_id is not None
+        ]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
     @staticmethod
     def delete_task(task):
         task.delete()
@@ -12,3 +48,175 @@ class TaskService:
         task = get_object_or_404(Task.global_objects, pk=pk)
         task.restore()
         return task
+
+    @staticmethod
+    def board_order():
+        """Sort key putting columns in board order (Not Started, In Progress, Completed)."""
+        return Case(
+            *[When(status=status, then=Value(rank)) for rank, status in enumerate(Task.Status.values)],
+            output_field=IntegerField(),
+        )
+
+    @staticmethod
+    def column(profile=None, collaborative_list=None, status=Task.Status.NOT_STARTED):
+        """Tasks sharing one board column, in display order."""
+        return Task.global_objects.filter(
+            profile=profile,
+            collaborative_list=collaborative_list,
+            status=status,
+        ).order_by('position', 'id')
+
+    @staticmethod
+    def append_position(profile=None, collaborative_list=None, status=Task.Status.NOT_STARTED):
+        last = TaskService.column(profile, collaborative_list, status).aggregate(last=Max('position'))['last']
+        return RankService.between(last, None)
+
+    @staticmethod
+    def update_task(task, changes, expected_version):
+        """
+        Apply `changes` with a single conditional UPDATE that only matches
+        while the row is still at `expected_version`.
+
+        Returns False (and leaves `task` untouched) if someone else got there
+        first. A status change also moves the task to the end of its new
+        column, in the same UPDATE.
+        """
+        now = timezone.now()
+        new_status = changes.get('status', task.status)
+        if new_status != task.status:
+            changes = {
+                **changes,
+                'position': TaskService.append_position(task.profile_id, task.collaborative_list_id, new_status),
+            }
+        updated = Task.objects.filter(pk=task.pk, version=expected_version).update(
+            **changes,
+            version=expected_version + 1,
+            updated_at=now,
+        )
+        if not updated:
+            return False
+
+        for field, value in changes.items():
+            setattr(task, field, value)
+        task.version = expected_version + 1
+        task.updated_at = now
+        TaskService.invalidate_page_cache(task.profile_id)
+        return True
+
+    @staticmethod
+    def move_task(task, status, after=None, before=None):
+        """
+        Place `task` in the `status` column between `after` and `before`.
+
+        Only the moved row is written. If a neighbour has no rank yet (rows
+        created before ranks existed) or both share one, the column is
+        rebalanced first.
+        """
+        try:
+            position = TaskService._position_between(after, before)
+        except ValueError:
+            TaskService.rebalance_column(task.profile, task.collaborative_list, status)
+            for neighbour in (after, before):
+                if neighbour:
+                    neighbour.refresh_from_db(fields=['position'])
+            position = TaskService._position_between(after, before)
+
+        task.status = status
+        task.position = position
+        task.updated_at = timezone.now()
+        Task.global_objects.filter(pk=task.pk).update(
+            status=task.status,
+            position=task.position,
+            version=F('version') + 1,
+            updated_at=task.updated_at,
+        )
+        task.version += 1
+        TaskService.invalidate_page_cache(task.profile_id)
+        return task
+
+    @staticmethod
+    def _position_between(after, before):
+        for neighbour in (after, before):
+            if neighbour and not neighbour.position:
+                raise ValueError(f"Task {neighbour.pk} has no position yet.")
+        return RankService.between(
+            after.position if after else None,
+            before.position if before else None,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def rebalance_column(profile=None, collaborative_list=None, status=Task.Status.NOT_STARTED):
+        tasks = list(TaskService.column(profile, collaborative_list, status).only('id', 'position'))
+        for task, position in zip(tasks, RankService.spread(len(tasks))):
+            task.position = position
+        Task.global_objects.bulk_update(tasks, ['position'], batch_size=500)
+        TaskService.invalidate_page_cache(getattr(profile, 'pk', profile))
+        return len(tasks)
+
+    ARCHIVE_FIELDS = [
+        'id', 'created_by_id', 'title', 'profile_id', 'description', 'due_datetime', 'priority',
+        'status', 'position', 'version', 'created_at', 'updated_at', 'collaborative_list_id',
+        'deleted_at',
+    ]
+
+    @staticmethod
+    def archive_completed_batch(cutoff, batch_size=500):
+        """
+        Move up to `batch_size` tasks completed before `cutoff` into the
+        archive table, soft-deleted ones included (they keep `deleted_at`).
+        Each batch is its own short transaction so SQLite's writer lock is
+        released between batches. Returns the number moved.
+
+        Rows are locked where the backend supports it, and the delete
+        re-checks the predicate, so a task reopened in the meantime stays
+        in the hot table and is not archived.
+        """
+        archivable = Task.global_objects.filter(status=Task.Status.COMPLETED, updated_at__lt=cutoff)
+        with transaction.atomic():
+            rows = list(
+                archivable.select_for_update(skip_locked=connection.features.has_select_for_update_skip_locked)
+                .order_by('updated_at')
+                .values(*TaskService.ARCHIVE_FIELDS)[:batch_size]
+            )
+            if not rows:
+                return 0
+
+            ids = [row['id'] for row in rows]
+            deleted, _ = archivable.filter(pk__in=ids).hard_delete()
+            if deleted < len(rows):
+                kept = set(Task.global_objects.filter(pk__in=ids).values_list('id', flat=True))
+                rows = [row for row in rows if row['id'] not in kept]
+            ArchivedTask.objects.bulk_create([ArchivedTask(**row) for row in rows], ignore_conflicts=True)
+        TaskService.invalidate_page_cache(*(row['profile_id'] for row in rows))
+        return len(rows)
+
+    @staticmethod
+    def calendar_buckets(queryset, start, end, tz, bucket='day'):
+        """
+        Per-day (or per-week) task counts by status and priority for tasks
+        due in [start, end), computed with one grouped query.
+        """
+        trunc = TruncWeek if bucket == 'week' else TruncDate
+        rows = (
+            queryset.filter(due_datetime__gte=start, due_datetime__lt=end)
+            .order_by()
+            .annotate(bucket=trunc('due_datetime', tzinfo=tz))
+            .values('bucket', 'status', 'priority')
+            .annotate(count=Count('id'))
+        )
+
+        buckets = {}
+        for row in rows:
+            key = row['bucket']
+            key = key.date() if hasattr(key, 'date') else key
+            entry = buckets.setdefault(key, {
+                'date': key.isoformat(),
+                'total': 0,
+                'by_status': {status: 0 for status in Task.Status.values},
+                'by_priority': {priority: 0 for priority in Task.Priority.values},
+            })
+            entry['total'] += row['count']
+            entry['by_status'][row['status']] += row['count']
+            entry['by_priority'][row['priority']] += row['count']
+        return [buckets[key] for key in sorted(buckets)]
@@ -1,33 +1,117 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from rest_framework import serializers
 from rest_framework.authtoken.models import Token
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from ..hashers import amake_password, averify_password, verify_password
 from ..models import Profile
-from ..serializers import UserSerializer
+from ..serializers import SignupSerializer, UserSerializer
 
 
 class UserService:
 
     @staticmethod
-    @transaction.atomic
     def signup(username, email, password):
-        serializer = UserSerializer(data={
+        data = UserService._validate_signup(username, email, password)
+        # Hash before the transaction so no lock is held while it runs
+        return UserService._create_user(data, make_password(data["password"]))
+
+    @staticmethod
+    async def asignup(username, email, password):
+        data = await sync_to_async(UserService._validate_signup)(username, email, password)
+        encoded = await amake_password(data["password"])
+        return await sync_to_async(UserService._create_user)(data, encoded)
+
+    @staticmethod
+    def _validate_signup(username, email, password):
+        serializer = SignupSerializer(data={
             "username": username,
             "email": email,
             "password": password
         })
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        token = Token.objects.create(user=user)
+        return serializer.validated_data
+
+    @staticmethod
+    def _create_user(data, encoded_password):
+        username, email = data["username"], data["email"]
+        try:
+            with transaction.atomic():
+                # One query for both uniqueness checks
+                taken = User.objects.filter(Q(username=username) | Q(email=email)).values_list("username", "email")
+                errors = {}
+                for other_username, other_email in taken:
+                    if other_username == username:
+                        errors["username"] = ["Username already taken."]
+                    if other_email == email:
+                        errors["email"] = ["Email already in use."]
+                if errors:
+                    raise serializers.ValidationError(errors)
+
+                user = User.objects.create(username=username, email=email, password=encoded_password)
+                # Also caches user.profile, so serializing the user needs no query
+                Profile.objects.create(user=user)
+                token = Token.objects.create(user=user)
+        except IntegrityError:
+            # Lost a race with a concurrent signup for the same username
+            raise serializers.ValidationError({"username": ["Username already taken."]})
         return user, token
 
     @staticmethod
     def login(username, password):
-        user = User.objects.filter(username=username).first()
-        if not user or not user.check_password(password):
+        user = UserService._find_for_login(username)
+        if user is None:
+            # Hash anyway so response time doesn't reveal whether the user exists
+            make_password(password)
+            return None, None
+        valid, needs_rehash = verify_password(password, user.password)
+        if not valid:
             return None, None
-        token, _ = Token.objects.get_or_create(user=user)
+        return user, UserService._finish_login(user, password if needs_rehash else None)
+
+    @staticmethod
+    async def alogin(username, password):
+        """login() for async callers: hashing runs in the hashing pool, not on the event loop."""
+        user = await sync_to_async(UserService._find_for_login)(username)
+        if user is None:
+            await amake_password(password)
+            return None, None
+        valid, needs_rehash = await averify_password(password, user.password)
+        if not valid:
+            return None, None
+        if needs_rehash:
+            user.password = await amake_password(password)
+        token = await sync_to_async(UserService._finish_login)(user, None, needs_rehash)
         return user, token
 
+    @staticmethod
+    def _find_for_login(username):
+        # Profile (for the response) and token come back in the same query
+        return User.objects.select_related("profile", "auth_token").filter(username=username).first()
+
+    @staticmethod
+    def _finish_login(user, rehash_password=None, password_changed=False):
+        """
+        Return the user's token. Creating a missing token and saving an
+        upgraded hash (the hasher policy changed since it was stored) happen
+        in one transaction; the usual login writes nothing.
+        """
+        token = getattr(user, "auth_token", None)
+        if rehash_password is not None:
+            user.set_password(rehash_password)
+            password_changed = True
+        if token is not None and not password_changed:
+            return token
+
+        with transaction.atomic():
+            if password_changed:
+                user.save(update_fields=["password"])
+            if token is None:
+                token, _ = Token.objects.get_or_create(user=user)
+        return token
+
     @staticmethod
     def logout(user):
         deleted_count, _ = Token.objects.filter(user=user).delete()
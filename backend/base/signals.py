@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Task
+from .services.task_service import TaskService
+
+
+@receiver(post_save, sender=Task)
+def invalidate_task_pages(sender, instance, **kwargs):
+    # Covers creates, full saves, soft deletes and restores (all call save()).
+    # Queryset .update() and hard-delete paths invalidate explicitly in
+    # TaskService. No post_delete receiver: it would turn off Django's fast
+    # delete for the archiver's bulk hard_delete().
+    TaskService.invalidate_page_cache(instance.profile_id)
@@ -1,3 +1,290 @@
-from django.test import TestCase
+import random
+import threading
+import time
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import CollaborativeList, IdempotencyKey, Job, Profile, Task
+from .services.job_service import JobService
+from .services.rank_service import RankService
+
+
+def make_client(username):
+    """An authenticated API client; skips password hashing to keep tests fast."""
+    user = User.objects.create(username=username, email=f"{username}@example.com")
+    Profile.objects.create(user=user)
+    client = APIClient()
+    client.force_authenticate(user)
+    return user, client
+
+
+class RankServiceTests(TestCase):
+    def test_between_stays_strictly_ordered_under_random_inserts(self):
+        rng = random.Random(0)
+        ranks = []
+        for _ in range(2000):
+            index = rng.randint(0, len(ranks))
+            before = ranks[index - 1] if index > 0 else None
+            after = ranks[index] if index < len(ranks) else None
+            rank = RankService.between(before, after)
+            if before:
+                self.assertLess(before, rank)
+            if after:
+                self.assertLess(rank, after)
+            self.assertFalse(rank.endswith(RankService.ZERO))
+            ranks.insert(index, rank)
+        self.assertEqual(ranks, sorted(set(ranks)))
+
+    def test_repeated_inserts_into_one_gap(self):
+        low, high = "V", "W"
+        for _ in range(200):
+            high = RankService.between(low, high)
+            self.assertLess(low, high)
+
+    def test_between_rejects_misordered_bounds(self):
+        with self.assertRaises(ValueError):
+            RankService.between("W", "V")
+        with self.assertRaises(ValueError):
+            RankService.between("V", "V")
+
+    def test_spread_is_increasing_for_any_count(self):
+        for count in (1, 2, 61, 62, 63, 3843, 3844, 5000):
+            ranks = RankService.spread(count)
+            self.assertEqual(len(ranks), count)
+            self.assertEqual(ranks, sorted(set(ranks)))
+            self.assertTrue(all(rank and not rank.endswith(RankService.ZERO) for rank in ranks))
+
+
+class TaskMoveTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client("alice")
+        profile = self.user.profile
+        self.list_a = CollaborativeList.objects.create(name="A", owner=profile)
+        self.list_b = CollaborativeList.objects.create(name="B", owner=profile)
+
+    def create_task(self, title, collaborative_list=None):
+        data = {"title": title}
+        if collaborative_list:
+            data["collaborative_list_id"] = collaborative_list.id
+        return self.client.post("/api/tasks/", data, format="json").data["id"]
+
+    def move(self, task_id, **data):
+        return self.client.post(f"/api/tasks/{task_id}/move/?view=collaborative", data, format="json")
+
+    def test_move_between_neighbours(self):
+        first, second, third = (self.create_task(title, self.list_a) for title in "abc")
+
+        response = self.move(third, after_id=first, before_id=second)
+
+        self.assertEqual(response.status_code, 200)
+        order = Task.objects.filter(collaborative_list=self.list_a).order_by("position")
+        self.assertEqual([task.id for task in order], [first, third, second])
+
+    def test_neighbour_from_another_list_is_rejected(self):
+        task = self.create_task("a", self.list_a)
+        other = self.create_task("b", self.list_b)
+
+        response = self.move(task, after_id=other)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Task.objects.get(pk=task).position, "V")
+
+    def test_unranked_neighbour_triggers_rebalance(self):
+        first, second, moved = (self.create_task(title, self.list_a) for title in "abc")
+        Task.objects.filter(pk__in=[first, second]).update(position="")
+
+        response = self.move(moved, after_id=first, before_id=second)
+
+        self.assertEqual(response.status_code, 200)
+        ranks = dict(Task.objects.values_list("id", "position"))
+        self.assertLess(ranks[first], ranks[moved])
+        self.assertLess(ranks[moved], ranks[second])
+
+
+class TaskVersionTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client("alice")
+        response = self.client.post("/api/tasks/", {"title": "Write report"}, format="json")
+        self.task_id = response.data["id"]
+
+    def test_update_with_current_version_bumps_it(self):
+        response = self.client.patch(f"/api/tasks/{self.task_id}/", {"title": "v2", "version": 1}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["version"], 2)
+
+    def test_stale_version_in_body_returns_409_with_current_task(self):
+        self.client.patch(f"/api/tasks/{self.task_id}/", {"title": "theirs", "version": 1}, format="json")
+
+        response = self.client.patch(f"/api/tasks/{self.task_id}/", {"title": "mine", "version": 1}, format="json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["current"]["title"], "theirs")
+        self.assertEqual(response.data["current"]["version"], 2)
+        self.assertEqual(Task.objects.get(pk=self.task_id).title, "theirs")
+
+    def test_stale_if_match_header_returns_409(self):
+        self.client.patch(f"/api/tasks/{self.task_id}/", {"title": "theirs"}, format="json")
+
+        response = self.client.patch(
+            f"/api/tasks/{self.task_id}/", {"title": "mine"}, format="json", HTTP_IF_MATCH='"1"'
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Task.objects.get(pk=self.task_id).version, 2)
+
+    def test_status_change_appends_to_new_column(self):
+        self.client.post("/api/tasks/", {"title": "Done", "status": "Completed"}, format="json")
+        done = Task.objects.get(title="Done")
+
+        response = self.client.patch(f"/api/tasks/{self.task_id}/", {"status": "Completed"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.data["position"], done.position)
+
+
+class JobClaimTests(TestCase):
+    def test_claimed_job_is_hidden_until_lease_expires(self):
+        job = JobService.enqueue("noop")
+
+        self.assertEqual(JobService.claim("worker-a").pk, job.pk)
+        self.assertIsNone(JobService.claim("worker-b"))
+
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        reclaimed = JobService.claim("worker-b")
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_higher_priority_runs_first(self):
+        JobService.enqueue("noop", priority=0)
+        urgent = JobService.enqueue("noop", priority=10)
+
+        self.assertEqual(JobService.claim("worker-a").pk, urgent.pk)
+
+    def test_failure_requeues_with_backoff(self):
+        JobService.handlers["always_fails"] = lambda: 1 / 0
+        self.addCleanup(JobService.handlers.pop, "always_fails")
+        job = JobService.enqueue("always_fails", max_attempts=2)
+
+        with self.assertLogs("base.services.job_service", "ERROR"):
+            self.assertFalse(JobService.run(JobService.claim("worker-a")))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+
+
+class ConcurrentJobClaimTests(TransactionTestCase):
+    def test_each_job_is_claimed_exactly_once(self):
+        jobs = [JobService.enqueue("noop") for _ in range(20)]
+        claims = []
+        start = threading.Barrier(4)
+
+        def worker(name):
+            start.wait()
+            try:
+                while True:
+                    try:
+                        job = JobService.claim(name)
+                    except OperationalError:
+                        # Table locked by another worker; try again
+                        time.sleep(0.01)
+                        continue
+                    if job is None:
+                        return
+                    claims.append(job.pk)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(f"worker-{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertCountEqual(claims, [job.pk for job in jobs])
+        self.assertFalse(Job.objects.exclude(attempts=1).exists())
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client("alice")
+
+    def batch(self, requests, transaction=False):
+        return self.client.post("/api/batch/", {"requests": requests, "transaction": transaction}, format="json")
+
+    def failing_batch(self):
+        return [
+            {"id": "create", "method": "POST", "path": "/api/tasks/", "body": {"title": "Kept?"}},
+            {"id": "missing", "method": "PATCH", "path": "/api/tasks/999999/", "body": {"title": "x"}},
+        ]
+
+    def test_sub_requests_run_with_callers_auth(self):
+        response = self.batch([
+            {"id": "me", "method": "GET", "path": "/api/users/me/"},
+            {"id": "tasks", "method": "GET", "path": "/api/tasks/?view=personal"},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        me, tasks = response.data["responses"]
+        self.assertEqual((me["id"], me["status"], me["body"]["username"]), ("me", 200, "alice"))
+        self.assertEqual((tasks["status"], tasks["body"]), (200, []))
+
+    def test_transactional_batch_rolls_back_on_failure(self):
+        response = self.batch(self.failing_batch(), transaction=True)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data["rolled_back"])
+        self.assertEqual([r["status"] for r in response.data["responses"]], [201, 404])
+        self.assertFalse(Task.objects.exists())
+
+    def test_non_transactional_batch_keeps_earlier_writes(self):
+        response = self.batch(self.failing_batch())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["status"] for r in response.data["responses"]], [201, 404])
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_batch_size_is_limited(self):
+        response = self.batch([{"method": "GET", "path": "/api/tasks/"}] * 21)
+
+        self.assertEqual(response.status_code, 400)
+
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        self.user, self.client = make_client("alice")
+
+    def create_task(self, key, title="Pay rent"):
+        return self.client.post("/api/tasks/", {"title": title}, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response_without_writing(self):
+        first = self.create_task("key-1")
+        retry = self.create_task("key-1")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.data["id"], first.data["id"])
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_same_key_with_different_body_returns_422(self):
+        self.create_task("key-1")
+
+        response = self.create_task("key-1", title="Something else")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        self.create_task("key-1")
+        _, other_client = make_client("bob")
+
+        response = other_client.post("/api/tasks/", {"title": "Pay rent"}, format="json", HTTP_IDEMPOTENCY_KEY="key-1")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Task.objects.count(), 2)
@@ -4,7 +4,8 @@ from .views import (
     CollaborativeListViewSet, tasks, auth, TaskViewSet,
     profile, signup, login, test_token,
     get_security_question, reset_password, update_security_question,
-    update_user_info, logout, verify_security_answer , me, change_password
+    update_user_info, logout, verify_security_answer , me, change_password,
+    batch,
 )
 
 # Router for tasks
@@ -36,5 +37,6 @@ urlpatterns = [
     path('api/', include([
         path('', include(router.urls)),
         path('users/', include(user_patterns)),
+        path('batch/', batch, name='batch'),
     ])),
 ]
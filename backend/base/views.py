@@ -11,17 +11,53 @@ from django.core.exceptions import ObjectDoesNotExist
 from .serializers import (
     UserSerializer,
     TaskSerializer,
+    ArchivedTaskSerializer,
     SetSecurityQuestionSerializer,
 )
-from rest_framework.exceptions import PermissionDenied, ValidationError
-from .serializers import CollaborativeListSerializer
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
+from .serializers import CollaborativeListSerializer, ListActivitySerializer
 
-from .models import Task, CollaborativeList
+from .models import ArchivedTask, Task, CollaborativeList, ListActivity
 from .services.user_service import UserService
 from .services.task_service import TaskService
+from .services.collaborative_list_service import CollaborativeListService
+from .services.idempotency_service import idempotent
+from .services.activity_service import ActivityService
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework import serializers
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from django.core.paginator import Paginator
+from django.utils.functional import SimpleLazyObject
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+class VersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Task was modified by someone else."
+    default_code = "conflict"
+
+    def __init__(self, current):
+        super().__init__()
+        # Set after init so the serialized task keeps its native types
+        self.detail = {"error": self.default_detail, "current": current}
+
+
+class TaskPagination(LimitOffsetPagination):
+    # Opt-in: without ?limit= the task list stays a plain array
+    default_limit = None
+    max_limit = 200
+
+
+class ActivityPagination(CursorPagination):
+    page_size = 50
+    ordering = '-id'
+
 
 class CollaborativeListViewSet(viewsets.ModelViewSet):
     serializer_class = CollaborativeListSerializer
@@ -37,10 +73,15 @@ class CollaborativeListViewSet(viewsets.ModelViewSet):
             Q(owner=user.profile) | Q(members=user.profile)
         ).distinct()
     
+    @idempotent("collaborative-list-create")
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user.profile)
     
     @action(detail=True, methods=['post'])  
+    @idempotent("collaborative-list-add-member")
     def add_member(self, request, pk=None):
         collab_list = self.get_object()
         if collab_list.owner != request.user.profile:
@@ -60,11 +101,74 @@ class CollaborativeListViewSet(viewsets.ModelViewSet):
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=404)
 
+    @action(detail=True, methods=['get'])
+    def activity(self, request, pk=None):
+        collab_list = self.get_object()
+        # Make this process's pending events visible before reading
+        ActivityService.flush()
+        queryset = ListActivity.objects.filter(collaborative_list=collab_list).select_related('actor__user')
+        paginator = ActivityPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(ListActivitySerializer(page, many=True).data)
+
+    def _bulk_usernames(self, request):
+        usernames = request.data.get('usernames')
+        if not isinstance(usernames, list) or not usernames:
+            raise ValidationError({"error": "usernames must be a non-empty list"})
+        if len(usernames) > CollaborativeListService.MAX_BULK_USERNAMES:
+            raise ValidationError({
+                "error": f"At most {CollaborativeListService.MAX_BULK_USERNAMES} usernames per request"
+            })
+        # Keep request order, drop duplicates
+        return list(dict.fromkeys(str(username).strip() for username in usernames))
+
+    @action(detail=True, methods=['post'])
+    def bulk_add_members(self, request, pk=None):
+        collab_list = self.get_object()
+        if collab_list.owner != request.user.profile:
+            return Response({"error": "Only owner can add members"}, status=403)
+
+        usernames = self._bulk_usernames(request)
+        results = CollaborativeListService.add_members(collab_list, usernames)
+        return Response({"results": results})
+
+    @action(detail=True, methods=['post'])
+    def bulk_remove_members(self, request, pk=None):
+        collab_list = self.get_object()
+        if collab_list.owner != request.user.profile:
+            return Response({"error": "Only owner can remove members"}, status=403)
+
+        usernames = self._bulk_usernames(request)
+        results = CollaborativeListService.remove_members(collab_list, usernames)
+        return Response({"results": results})
+
 
 # ---------------- Home ----------------
+TASKS_PAGE_SIZE = 50
+CALENDAR_MAX_DAYS = 400
+
+
 def tasks(request):
-    tasks = Task.objects.all()
-    return render(request, "base/tasks.html", {"tasks": tasks})
+    context = {"show_board": False}
+    if request.user.is_authenticated and hasattr(request.user, "profile"):
+        profile = request.user.profile
+        try:
+            page_number = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page_number = 1
+
+        queryset = Task.objects.filter(
+            profile=profile, collaborative_list__isnull=True
+        ).order_by(TaskService.board_order(), 'position', 'id')
+        paginator = Paginator(queryset, TASKS_PAGE_SIZE)
+        context.update({
+            "show_board": True,
+            # Lazy: only evaluated (COUNT + page query) on a fragment cache miss
+            "page_obj": SimpleLazyObject(lambda: paginator.get_page(page_number)),
+            "page_number": page_number,
+            "tasks_cache_version": TaskService.page_cache_version(profile.id),
+        })
+    return render(request, "base/tasks.html", context)
 
 def auth(request):
     return render(request, "base/index.html")
@@ -77,12 +181,15 @@ class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     authentication_classes = [TokenAuthentication, SessionAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskPagination
 
     def get_queryset(self):
         user = self.request.user
         if not hasattr(user, "profile"):
             return Task.objects.none()
-        
+
+        # ?archived=true reads the cold ArchivedTask table (read-only)
+        manager = ArchivedTask.objects.filter(deleted_at__isnull=True) if self._archived_mode() else Task.objects
         view_type = self.request.query_params.get('view', 'personal')
         
         if view_type == 'collaborative':
@@ -94,19 +201,43 @@ class TaskViewSet(viewsets.ModelViewSet):
             
             if list_id:
                 # Filter by specific list
-                return Task.objects.filter(
+                queryset = manager.filter(
                     collaborative_list_id=list_id,
                     collaborative_list__in=accessible_lists  # Security check
                 )
             else:
                 # Return all accessible tasks
-                return Task.objects.filter(collaborative_list__in=accessible_lists)
+                queryset = manager.filter(collaborative_list__in=accessible_lists)
         else:
-            return Task.objects.filter(
+            queryset = manager.filter(
                 profile=user.profile,
                 collaborative_list__isnull=True
             )
 
+        if self._archived_mode():
+            return queryset.order_by('-updated_at')
+
+        # ?status= pages one board column at a time off the column indexes
+        task_status = self.request.query_params.get('status')
+        if task_status:
+            return queryset.filter(status=task_status).order_by('position', 'id')
+        return queryset.order_by(TaskService.board_order(), 'position', 'id')
+
+    def get_serializer_class(self):
+        if self._archived_mode():
+            return ArchivedTaskSerializer
+        return super().get_serializer_class()
+
+    def _archived_mode(self):
+        return (
+            self.action in ('list', 'retrieve')
+            and self.request.query_params.get('archived') == 'true'
+        )
+
+    @idempotent("task-create")
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Create task in personal or collaborative list"""
         collab_list_id = self.request.data.get('collaborative_list_id')
@@ -120,35 +251,154 @@ class TaskViewSet(viewsets.ModelViewSet):
                     self.request.user.profile not in collab_list.members.all()):
                     raise PermissionDenied("No access to this list")
                 
-                serializer.save(collaborative_list=collab_list, created_by=self.request.user.profile)
+                position = TaskService.append_position(
+                    collaborative_list=collab_list,
+                    status=serializer.validated_data.get('status', Task.Status.NOT_STARTED),
+                )
+                serializer.save(collaborative_list=collab_list, created_by=self.request.user.profile, position=position)
+                ActivityService.record(serializer.instance, ListActivity.Action.CREATED, self.request.user.profile)
             except CollaborativeList.DoesNotExist:
                 raise ValidationError("Collaborative list not found")
         else:
             # Personal task
-            serializer.save(profile=self.request.user.profile, created_by=self.request.user.profile)
+            position = TaskService.append_position(
+                profile=self.request.user.profile,
+                status=serializer.validated_data.get('status', Task.Status.NOT_STARTED),
+            )
+            serializer.save(profile=self.request.user.profile, created_by=self.request.user.profile, position=position)
             
     def perform_update(self, serializer):
-        # Ensure user owns the task being edited
-        instance = self.get_object()
-        if instance.profile != self.request.user.profile:
+        # Personal tasks must be owned; collaborative tasks were already
+        # scoped to the user's lists by get_queryset()
+        instance = serializer.instance
+        if instance.collaborative_list_id is None and instance.profile_id != self.request.user.profile.id:
             raise PermissionDenied("You cannot edit this task.")
-        serializer.save()
+
+        expected_version = self._expected_version(instance)
+        previous_status = instance.status
+        if not TaskService.update_task(instance, serializer.validated_data, expected_version):
+            current = Task.objects.filter(pk=instance.pk).first()
+            raise VersionConflict(TaskSerializer(current).data if current else None)
+        ActivityService.record_update(instance, previous_status, self.request.user.profile)
+
+    def _expected_version(self, instance):
+        """Version the client edited: If-Match header, then body, then the row we read."""
+        raw = self.request.headers.get("If-Match") or self.request.data.get("version")
+        if raw in (None, ""):
+            return instance.version
+        try:
+            return int(str(raw).removeprefix("W/").strip('"'))
+        except ValueError:
+            raise ValidationError({"error": "Invalid version."})
 
     def perform_destroy(self, instance):
-        # Ensure user owns the task being deleted
-        if instance.profile != self.request.user.profile:
+        # Same rule as perform_update: own personal tasks, any task in a
+        # list the user can see
+        if instance.collaborative_list_id is None and instance.profile_id != self.request.user.profile.id:
             raise PermissionDenied("You cannot delete this task.")
         instance.delete()
+        ActivityService.record(instance, ListActivity.Action.DELETED, self.request.user.profile)
+
+    @action(detail=True, methods=["post"])
+    def move(self, request, pk=None):
+        """
+        Drag-and-drop: move a task into `status`, between the tasks
+        `after_id` (above it) and `before_id` (below it). Either may be
+        omitted for the top or bottom of the column.
+        """
+        task = self.get_object()
+        new_status = request.data.get("status", task.status)
+        if new_status not in Task.Status.values:
+            return Response({"error": "Invalid status."}, status=400)
+
+        after_id = request.data.get("after_id")
+        before_id = request.data.get("before_id")
+        # Neighbours must share the moved task's own column (same owner or
+        # list), or their ranks mean nothing for it
+        column = TaskService.column(
+            task.profile_id, task.collaborative_list_id, new_status
+        ).filter(deleted_at__isnull=True).only("id", "position")
+        try:
+            after = column.get(pk=after_id) if after_id else None
+            before = column.get(pk=before_id) if before_id else None
+        except (Task.DoesNotExist, ValueError, TypeError):
+            return Response({"error": "Neighbour task not found in this column."}, status=400)
+
+        previous_status = task.status
+        try:
+            TaskService.move_task(task, new_status, after=after, before=before)
+        except ValueError:
+            return Response({"error": "after_id must come before before_id."}, status=400)
+        ActivityService.record_update(task, previous_status, request.user.profile)
+        return Response(self.get_serializer(task).data)
+
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """
+        Calendar/agenda data for tasks due between `start` and `end`
+        (inclusive dates, YYYY-MM-DD) in timezone `tz`: per-day or per-week
+        (`bucket=week`) counts by status and priority, plus the tasks due on
+        `day` if given. Uses the same `view`/`list_id` scoping as the list.
+        """
+        params = request.query_params
+        try:
+            tz = ZoneInfo(params.get("tz", "UTC"))
+        except (ZoneInfoNotFoundError, ValueError):
+            return Response({"error": "Unknown timezone."}, status=400)
+
+        try:
+            start = date.fromisoformat(params["start"])
+            end = date.fromisoformat(params["end"])
+            day = date.fromisoformat(params["day"]) if params.get("day") else None
+        except KeyError:
+            return Response({"error": "start and end are required."}, status=400)
+        except ValueError:
+            return Response({"error": "Dates must be YYYY-MM-DD."}, status=400)
+        if end < start or (end - start).days > CALENDAR_MAX_DAYS:
+            return Response({"error": f"Range must be 0-{CALENDAR_MAX_DAYS} days."}, status=400)
+
+        bucket = "week" if params.get("bucket") == "week" else "day"
+        queryset = self.get_queryset()
+        range_start = datetime.combine(start, time.min, tzinfo=tz)
+        range_end = datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz)
+        data = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "timezone": str(tz),
+            "bucket": bucket,
+            "buckets": TaskService.calendar_buckets(queryset, range_start, range_end, tz, bucket),
+        }
+
+        if day:
+            day_start = datetime.combine(day, time.min, tzinfo=tz)
+            day_tasks = queryset.filter(
+                due_datetime__gte=day_start,
+                due_datetime__lt=day_start + timedelta(days=1),
+            ).order_by("due_datetime", "id").select_related("created_by__user")
+            data["day"] = day.isoformat()
+            data["tasks"] = self.get_serializer(day_tasks, many=True).data
+        return Response(data)
+
+    def _can_access(self, task):
+        profile = self.request.user.profile
+        if task.collaborative_list_id is None:
+            return task.profile_id == profile.id
+        return CollaborativeList.objects.filter(
+            Q(owner=profile) | Q(members=profile), pk=task.collaborative_list_id
+        ).exists()
 
     @action(detail=True, methods=["post"])
     def restore(self, request, pk=None):
         """
-        Optional: restore soft-deleted task, but only if it belongs to current user.
+        Optional: restore soft-deleted task, but only if it belongs to current
+        user (or to a collaborative list they can access).
         """
         try:
-            task = TaskService.restore_task(pk)
-            if task.profile != request.user.profile:
+            task = Task.global_objects.get(pk=pk)
+            if not self._can_access(task):
                 raise PermissionDenied("You cannot restore this task.")
+            task = TaskService.restore_task(pk)
+            ActivityService.record(task, ListActivity.Action.RESTORED, request.user.profile)
             serializer = self.get_serializer(task)
             return Response(serializer.data)
         except ObjectDoesNotExist:
@@ -315,3 +565,97 @@ def change_password(request):
 @permission_classes([IsAuthenticated])
 def test_token(request):
     return Response({"success": "Token valid!"})
+
+
+BATCH_MAX_REQUESTS = 20
+BATCH_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+
+
+class _BatchRollback(Exception):
+    pass
+
+
+def _run_sub_request(request, spec):
+    """Dispatch one batch entry through the URL resolver as the batch's user."""
+    method = str(spec.get("method", "GET")).upper()
+    path, _, query_string = str(spec.get("path", "")).partition("?")
+    if method not in BATCH_METHODS:
+        return 400, {"error": f"Unsupported method {method}."}
+    if not path.startswith("/api/") or path.rstrip("/") == "/api/batch":
+        return 400, {"error": "Only /api/ paths can be batched."}
+
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return 404, {"error": "Not found."}
+
+    body = json.dumps(spec.get("body") or {}).encode()
+    sub = HttpRequest()
+    sub.method = method
+    sub.path = sub.path_info = path
+    sub.META = {
+        **request._request.META,
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+    }
+    # Per-request headers of the batch itself must not leak into every entry
+    sub.META.pop("HTTP_IDEMPOTENCY_KEY", None)
+    sub.META.pop("HTTP_IF_MATCH", None)
+    sub.GET = QueryDict(query_string)
+    sub._stream = io.BytesIO(body)
+    sub._read_started = False
+    sub.user = request.user
+    # Reuse the batch's authentication instead of re-running it per entry
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    sub._dont_enforce_csrf_checks = True
+
+    response = match.func(sub, *match.args, **match.kwargs)
+    if hasattr(response, "data"):
+        return response.status_code, response.data
+    return response.status_code, None
+
+
+@api_view(["POST"])
+@authentication_classes([TokenAuthentication, SessionAuthentication])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several API calls in one round trip.
+
+    Body: {"requests": [{"method": "GET", "path": "/api/tasks/", "body": {...}}, ...],
+           "transaction": false}
+    With "transaction": true, all entries run in one database transaction
+    that is rolled back if any of them fails.
+    """
+    specs = request.data.get("requests")
+    if not isinstance(specs, list) or not specs:
+        return Response({"error": "requests must be a non-empty list."}, status=400)
+    if len(specs) > BATCH_MAX_REQUESTS:
+        return Response({"error": f"At most {BATCH_MAX_REQUESTS} requests per batch."}, status=400)
+    if not all(isinstance(spec, dict) for spec in specs):
+        return Response({"error": "Each request must be an object."}, status=400)
+
+    atomic = bool(request.data.get("transaction"))
+    results = []
+
+    def run_all():
+        for spec in specs:
+            status_code, body = _run_sub_request(request, spec)
+            results.append({"id": spec.get("id"), "status": status_code, "body": body})
+            if atomic and status_code >= 400:
+                raise _BatchRollback()
+
+    if not atomic:
+        run_all()
+        return Response({"responses": results})
+
+    try:
+        with transaction.atomic():
+            run_all()
+    except _BatchRollback:
+        return Response({"rolled_back": True, "responses": results}, status=400)
+    return Response({"rolled_back": False, "responses": results})
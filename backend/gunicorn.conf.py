@@ -0,0 +1,51 @@
+"""
+Gunicorn production profile for JustDoIt.
+
+Loaded automatically by gunicorn from the working directory (see Procfile).
+Every knob can be overridden from the environment so the same file works on
+Render, a VM or a laptop.
+
+For the full list of settings, see
+https://docs.gunicorn.org/en/stable/settings.html
+"""
+import multiprocessing
+import os
+
+# Turn off DEBUG-only overhead (query logging, technical 500 pages) unless the
+# operator explicitly asks for it. Must run before the app is imported.
+os.environ.setdefault('DEBUG', 'False')
+
+cpu_count = multiprocessing.cpu_count()
+
+# Workers / threads
+# Requests mostly wait on SQLite and password hashing, so a few threads per
+# process give concurrency without multiplying the per-process memory.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', cpu_count * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Import Django once in the master so workers share its pages copy-on-write.
+preload_app = True
+
+# Recycle workers to cap slow memory growth; jitter avoids a thundering herd.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Timeouts
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Keep heartbeat files off disk-backed /tmp on container hosts.
+worker_tmp_dir = os.environ.get('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # With preload_app the master imported Django; never let a worker reuse a
+    # database connection that may have been opened before the fork.
+    from django.db import connections
+    connections.close_all()